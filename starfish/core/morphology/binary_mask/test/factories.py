@@ -8,7 +8,7 @@ from ..binary_mask import BinaryMaskCollection
 
 def label_array_2d() -> Tuple[np.ndarray, Mapping[Coordinates, ArrayLike[Number]]]:
     """Convenience method to return a 2D label array with corresponding physical coordinates."""
-    label_array = np.zeros((5, 6), dtype=np.int32)
+    label_array = np.zeros((5, 6), dtype=np.intp)
     label_array[0] = 1
     label_array[3:5, 3:6] = 2
     label_array[-1, -1] = 0
@@ -40,7 +40,7 @@ def binary_arrays_2d() -> Tuple[Sequence[np.ndarray], Mapping[Coordinates, Array
 
 def label_array_3d() -> Tuple[np.ndarray, Mapping[Coordinates, ArrayLike[Number]]]:
     """Convenience method to return a 3D label array with corresponding physical coordinates."""
-    label_array = np.zeros((2, 5, 6), dtype=np.int32)
+    label_array = np.zeros((2, 5, 6), dtype=np.intp)
     label_array[0, 0] = 1
     label_array[:, 3:5, 3:6] = 2
     label_array[-1, -1, -1] = 0
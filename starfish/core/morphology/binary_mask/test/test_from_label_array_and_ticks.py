@@ -6,17 +6,48 @@ from .factories import label_array_2d, label_array_3d
 from ..binary_mask import BinaryMaskCollection
 
 
-def test_2d():
-    """Simple case of BinaryMaskCollection.from_label_array_and_ticks with 2D data.  Pixel ticks are
-    inferred."""
-    label_array, physical_ticks = label_array_2d()
+@pytest.fixture(scope="module")
+def label_array_and_ticks_2d():
+    """2D label array and physical ticks, built once per module."""
+    return label_array_2d()
 
-    binary_mask_collection = BinaryMaskCollection.from_label_array_and_ticks(
+
+@pytest.fixture(scope="module")
+def label_array_and_ticks_3d():
+    """3D label array and physical ticks, built once per module."""
+    return label_array_3d()
+
+
+@pytest.fixture(scope="module")
+def binary_mask_collection_2d(label_array_and_ticks_2d):
+    """BinaryMaskCollection built from the 2D label array with inferred pixel ticks."""
+    label_array, physical_ticks = label_array_and_ticks_2d
+    return BinaryMaskCollection.from_label_array_and_ticks(
+        label_array,
+        None,
+        physical_ticks,
+        None
+    )
+
+
+@pytest.fixture(scope="module")
+def binary_mask_collection_3d(label_array_and_ticks_3d):
+    """BinaryMaskCollection built from the 3D label array with inferred pixel ticks."""
+    label_array, physical_ticks = label_array_and_ticks_3d
+    return BinaryMaskCollection.from_label_array_and_ticks(
         label_array,
         None,
         physical_ticks,
         None
     )
+
+
+def test_2d(label_array_and_ticks_2d, binary_mask_collection_2d):
+    """Simple case of BinaryMaskCollection.from_label_array_and_ticks with 2D data.  Pixel ticks are
+    inferred."""
+    _, physical_ticks = label_array_and_ticks_2d
+    binary_mask_collection = binary_mask_collection_2d
+
     assert len(binary_mask_collection) == 2
 
     region_0, region_1 = binary_mask_collection.masks()
@@ -45,17 +76,12 @@ def test_2d():
                           physical_ticks[Coordinates.X][3:6])
 
 
-def test_3d():
+def test_3d(label_array_and_ticks_3d, binary_mask_collection_3d):
     """Simple case of BinaryMaskCollection.from_label_array_and_ticks with 3D data.  Pixel ticks are
     inferred."""
-    label_array, physical_ticks = label_array_3d()
+    _, physical_ticks = label_array_and_ticks_3d
+    binary_mask_collection = binary_mask_collection_3d
 
-    binary_mask_collection = BinaryMaskCollection.from_label_array_and_ticks(
-        label_array,
-        None,
-        physical_ticks,
-        None
-    )
     assert len(binary_mask_collection) == 2
 
     region_0, region_1 = binary_mask_collection.masks()
@@ -90,10 +116,10 @@ def test_3d():
                           physical_ticks[Coordinates.X][3:6])
 
 
-def test_from_label_array_provided_pixel_ticks():
+def test_from_label_array_provided_pixel_ticks(label_array_and_ticks_2d):
     """BinaryMaskCollection.from_label_array_and_ticks with 2D data and some pixel ticks
     provided."""
-    label_array, physical_ticks = label_array_2d()
+    label_array, physical_ticks = label_array_and_ticks_2d
     pixel_ticks = {
         Axes.X: [2, 3, 4, 5, 6, 7],
     }
@@ -132,10 +158,10 @@ def test_from_label_array_provided_pixel_ticks():
                           physical_ticks[Coordinates.X][3:6])
 
 
-def test_incorrectly_sized_pixel_ticks():
+def test_incorrectly_sized_pixel_ticks(label_array_and_ticks_2d):
     """BinaryMaskCollection.from_label_array_and_ticks with 2D data and some pixel ticks provided,
     albeit of the wrong cardinality."""
-    label_array, physical_ticks = label_array_2d()
+    label_array, physical_ticks = label_array_and_ticks_2d
     pixel_ticks = {
         Axes.X: [2, 3, 4, 5, 6, 7, 8],
     }
@@ -149,70 +175,77 @@ def test_incorrectly_sized_pixel_ticks():
         )
 
 
-def test_missing_physical_ticks_2d():
+@pytest.mark.parametrize("dropped_coord", [Coordinates.Y, Coordinates.X])
+def test_missing_physical_ticks_2d(label_array_and_ticks_2d, dropped_coord):
     """BinaryMaskCollection.from_label_array_and_ticks with some physical ticks missing."""
-    label_array, physical_ticks_all = label_array_2d()
-
-    for deleted_physical_ticks in physical_ticks_all.keys():
-        physical_ticks = {
-            coord: physical_ticks
-            for coord, physical_ticks in physical_ticks_all.items()
-            if coord != deleted_physical_ticks
-        }
-        with pytest.raises(ValueError):
-            BinaryMaskCollection.from_label_array_and_ticks(
-                label_array,
-                None,
-                physical_ticks,
-                None
-            )
-
-
-def test_missing_physical_ticks_3d():
+    label_array, physical_ticks_all = label_array_and_ticks_2d
+    physical_ticks = {
+        coord: physical_ticks
+        for coord, physical_ticks in physical_ticks_all.items()
+        if coord != dropped_coord
+    }
+
+    with pytest.raises(ValueError):
+        BinaryMaskCollection.from_label_array_and_ticks(
+            label_array,
+            None,
+            physical_ticks,
+            None
+        )
+
+
+@pytest.mark.parametrize("dropped_coord", [Coordinates.Z, Coordinates.Y, Coordinates.X])
+def test_missing_physical_ticks_3d(label_array_and_ticks_3d, dropped_coord):
     """BinaryMaskCollection.from_label_array_and_ticks with some physical ticks missing."""
-    label_array, physical_ticks_all = label_array_3d()
-
-    for deleted_physical_ticks in physical_ticks_all.keys():
-        physical_ticks = {
-            coord: physical_ticks
-            for coord, physical_ticks in physical_ticks_all.items()
-            if coord != deleted_physical_ticks
-        }
-        with pytest.raises(ValueError):
-            BinaryMaskCollection.from_label_array_and_ticks(
-                label_array,
-                None,
-                physical_ticks,
-                None
-            )
-
-
-def test_incorrectly_sized_physical_ticks():
-    """BinaryMaskCollection.from_label_array_and_ticks with some physical ticks incorrectly
-    sized."""
-    label_image_array_2d, _ = label_array_2d()
-    physical_ticks_2d = {Coordinates.Y: [1.2, 2.4, 3.6, 4.8, 6.0],
-                         Coordinates.X: [7.2, 8.4, 9.6, 10.8, 12]}
+    label_array, physical_ticks_all = label_array_and_ticks_3d
+    physical_ticks = {
+        coord: physical_ticks
+        for coord, physical_ticks in physical_ticks_all.items()
+        if coord != dropped_coord
+    }
+
+    with pytest.raises(ValueError):
+        BinaryMaskCollection.from_label_array_and_ticks(
+            label_array,
+            None,
+            physical_ticks,
+            None
+        )
+
+
+@pytest.mark.parametrize("truncated_coord", [Coordinates.Y, Coordinates.X])
+def test_incorrectly_sized_physical_ticks_2d(label_array_and_ticks_2d, truncated_coord):
+    """BinaryMaskCollection.from_label_array_and_ticks with 2D data and some physical ticks
+    incorrectly sized."""
+    label_array, physical_ticks_all = label_array_and_ticks_2d
+    physical_ticks = {
+        coord: physical_ticks[:-1] if coord == truncated_coord else physical_ticks
+        for coord, physical_ticks in physical_ticks_all.items()
+    }
 
     with pytest.raises(ValueError):
         BinaryMaskCollection.from_label_array_and_ticks(
-            label_image_array_2d,
+            label_array,
             None,
-            physical_ticks_2d,
+            physical_ticks,
             None
         )
 
-    label_image_array_3d, _ = label_array_3d()
-    physical_ticks_3d = {
-        Coordinates.Z: [0.0, 1.0],
-        Coordinates.Y: [1.2, 2.4, 3.6, 4.8],
-        Coordinates.X: [7.2, 8.4, 9.6, 10.8, 12, 13.2]
+
+@pytest.mark.parametrize("truncated_coord", [Coordinates.Z, Coordinates.Y, Coordinates.X])
+def test_incorrectly_sized_physical_ticks_3d(label_array_and_ticks_3d, truncated_coord):
+    """BinaryMaskCollection.from_label_array_and_ticks with 3D data and some physical ticks
+    incorrectly sized."""
+    label_array, physical_ticks_all = label_array_and_ticks_3d
+    physical_ticks = {
+        coord: physical_ticks[:-1] if coord == truncated_coord else physical_ticks
+        for coord, physical_ticks in physical_ticks_all.items()
     }
 
     with pytest.raises(ValueError):
         BinaryMaskCollection.from_label_array_and_ticks(
-            label_image_array_3d,
+            label_array,
             None,
-            physical_ticks_3d,
+            physical_ticks,
             None
         )
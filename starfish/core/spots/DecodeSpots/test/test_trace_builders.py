@@ -1,4 +1,7 @@
+from itertools import product
+
 import numpy as np
+import pandas as pd
 import pytest
 
 from starfish import ImageStack
@@ -10,6 +13,7 @@ from starfish.core.test.factories import (
     two_spot_one_hot_coded_data_factory,
     two_spot_sparse_coded_data_factory,
 )
+from starfish.core.types import PerImageSliceSpotResults, SpotAttributes, SpotFindingResults
 from starfish.types import Axes, Features, FunctionSource
 
 
@@ -144,3 +148,45 @@ def test_spot_finding_reference_image_sequential(
     spots = spot_detector.run(image_stack=EMPTY_IMAGESTACK, reference_image=reference_image)
     empty_intensity_table = trace_builders.build_traces_sequential(spots)
     assert empty_intensity_table.sizes[Features.AXIS] == 0
+
+
+def test_sequential_traces_place_intensities_by_round_and_ch():
+    """
+    Each spot becomes its own trace, whose only nonzero value is the spot's intensity in the
+    (round, ch) in which it was found.  Uses a different number of rounds and channels, and a
+    different number of spots in each tile, so that swapping round and channel, or misaligning
+    tiles, would move intensities into the wrong cells.
+    """
+    n_rounds, n_chs = 3, 2
+    stack = ImageStack.from_numpy(np.zeros((n_rounds, n_chs, 1, 10, 10), dtype=np.float32))
+    spot_results = SpotFindingResults(imagestack_coords=stack.xarray.coords, log=stack.log)
+    for r, c in product(range(n_rounds), range(n_chs)):
+        n_spots = r * n_chs + c + 1
+        spot_results[{Axes.ROUND: r, Axes.CH: c}] = PerImageSliceSpotResults(
+            spot_attrs=SpotAttributes(pd.DataFrame({
+                Axes.ZPLANE.value: np.zeros(n_spots, dtype=int),
+                Axes.Y.value: np.arange(n_spots),
+                Axes.X.value: np.arange(n_spots),
+                Features.SPOT_RADIUS: np.ones(n_spots),
+                # encode the (round, ch) in which each spot was found in its intensity
+                Features.INTENSITY: 100 * (r + 1) + 10 * (c + 1) + np.arange(n_spots),
+            })),
+            extras=None)
+
+    intensity_table = trace_builders.build_traces_sequential(spot_results)
+
+    assert intensity_table.sizes[Features.AXIS] == sum(range(1, n_rounds * n_chs + 1))
+    measured = set()
+    for feature in range(intensity_table.sizes[Features.AXIS]):
+        trace = intensity_table[feature]
+        value = float(trace.max())
+        r, c = int(value // 100) - 1, int(value // 10) % 10 - 1
+        assert trace.sel({Axes.ROUND.value: r, Axes.CH.value: c}) == value
+        assert trace.sum() == value
+        measured.add(value)
+    expected = {
+        100 * (r + 1) + 10 * (c + 1) + i
+        for r, c in product(range(n_rounds), range(n_chs))
+        for i in range(r * n_chs + c + 1)
+    }
+    assert measured == expected
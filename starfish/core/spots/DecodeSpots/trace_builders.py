@@ -1,6 +1,8 @@
 from typing import Callable, Mapping
 
+import numpy as np
 import pandas as pd
+from scipy.sparse import coo_matrix
 
 from starfish.core.intensity_table.intensity_table import IntensityTable
 from starfish.core.types import (
@@ -55,23 +57,34 @@ def build_traces_sequential(spot_results: SpotFindingResults, **kwargs) -> Inten
 
     """
 
+    # every SpotAttributes shares the same columns, so there is nothing to gain from sorting them
     all_spots = pd.concat([sa.spot_attrs.data for sa in spot_results.values()],
-                          ignore_index=True, sort=True)
+                          ignore_index=True, sort=False, copy=False)
     # reassign spot_ids to index number so they are unique
     all_spots['spot_id'] = all_spots.index
 
-    intensity_table = IntensityTable.zeros(
-        spot_attributes=SpotAttributes(all_spots),
-        ch_labels=spot_results.ch_labels,
-        round_labels=spot_results.round_labels,
-    )
-
-    i = 0
-    for (r, c), spot_attrs in spot_results.items():
-        for _, row in spot_attrs.spot_attrs.data.iterrows():
-            selector = dict(features=i, c=c, r=r)
-            intensity_table.loc[selector] = row[Features.INTENSITY]
-            i += 1
+    # each spot becomes its own feature, so the (feature, round * ch) matrix has exactly one
+    # nonzero per row.  Assemble it as COO triplets and densify once.
+    round_labels = spot_results.round_labels
+    ch_labels = spot_results.ch_labels
+    round_pos = {r: pos for pos, r in enumerate(round_labels)}
+    ch_pos = {c: pos for pos, c in enumerate(ch_labels)}
+    n_spots = [len(spot_attrs.spot_attrs.data) for spot_attrs in spot_results.values()]
+    round_index = np.repeat([round_pos[r] for r, _ in spot_results.keys()], n_spots)
+    ch_index = np.repeat([ch_pos[c] for _, c in spot_results.keys()], n_spots)
+    intensities = np.concatenate([
+        spot_attrs.spot_attrs.data[Features.INTENSITY].to_numpy()
+        for spot_attrs in spot_results.values()
+    ])
+    n_features = intensities.size
+    data = coo_matrix(
+        (intensities, (np.arange(n_features), round_index * len(ch_labels) + ch_index)),
+        shape=(n_features, len(round_labels) * len(ch_labels)),
+        dtype=np.float64,
+    ).toarray().reshape(n_features, len(round_labels), len(ch_labels))
+
+    intensity_table = IntensityTable.from_spot_data(
+        data, SpotAttributes(all_spots), round_labels, ch_labels)
     return intensity_table
 
 
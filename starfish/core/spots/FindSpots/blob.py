@@ -175,7 +175,9 @@ class BlobDetector(FindSpotsAlgorithm):
             (Optional) a reference image. If provided, spots will be found in this image, and then
             the locations that correspond to these spots will be measured across each channel.
         n_processes : Optional[int] = None,
-            Number of processes to devote to spot finding.
+            Number of processes to devote to spot finding.  If reference_image is provided, this
+            is also the number of threads used to measure the reference spots across the
+            (round, ch) tiles of image_stack.
         """
         spot_finding_method = partial(self.image_to_spots, *args)
         if reference_image:
@@ -186,7 +188,8 @@ class BlobDetector(FindSpotsAlgorithm):
             results = spot_finding_utils.measure_intensities_at_spot_locations_across_imagestack(
                 data_image=image_stack,
                 reference_spots=reference_spots,
-                measurement_function=self.measurement_function)
+                measurement_function=self.measurement_function,
+                n_processes=n_processes)
         else:
             if self.detector_method is blob_doh and self.is_volume:
                 raise ValueError("blob_doh only support 2d images")
@@ -322,7 +322,9 @@ class LocalMaxPeakFinder(FindSpotsAlgorithm):
             (Optional) a reference image. If provided, spots will be found in this image, and then
             the locations that correspond to these spots will be measured across each channel.
         n_processes : Optional[int] = None,
-            Number of processes to devote to spot finding.
+            Number of processes to devote to spot finding.  If reference_image is provided, this
+            is also the number of threads used to measure the reference spots across the
+            (round, ch) tiles of image_stack.
         """
         spot_finding_method = partial(self.image_to_spots, **self.kwargs)
         if reference_image:
@@ -340,7 +342,8 @@ class LocalMaxPeakFinder(FindSpotsAlgorithm):
             results = spot_finding_utils.measure_intensities_at_spot_locations_across_imagestack(
                 data_image=image_stack,
                 reference_spots=spot_attributes_lists[0][0],
-                measurement_function=self.measurement_function)
+                measurement_function=self.measurement_function,
+                n_processes=n_processes)
         else:
             spot_attributes_lists = image_stack.transform(
                 func=spot_finding_method,
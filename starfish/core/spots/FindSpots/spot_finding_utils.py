@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from itertools import product
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -14,6 +16,114 @@ from starfish.core.types import (
     SpotFindingResults
 )
 
+# numpy reductions that accept an ``axis`` argument.  For these, all spots whose bounding boxes
+# share a shape can be gathered into a single array and reduced in one call.
+_BATCHED_REDUCTIONS = (np.max, np.amax, np.min, np.amin, np.mean, np.sum, np.median)
+
+# upper bound on the number of pixels gathered into memory for a single batched reduction
+_MAX_BATCH_PIXELS = 2 ** 24
+
+
+def _is_batched_reduction(measurement_function: Callable) -> bool:
+    """Return True if measurement_function is one of _BATCHED_REDUCTIONS.  Compared by identity,
+    so that arbitrary (possibly unhashable) callables are accepted."""
+    return any(measurement_function is reduction for reduction in _BATCHED_REDUCTIONS)
+
+
+@dataclass
+class _BoundingBoxes:
+    """
+    Bounding boxes of a set of spots, stored as one int64 array per axis limit rather than as rows
+    of a table.  Maxima are exclusive.
+    """
+    z_min: np.ndarray
+    z_max: np.ndarray
+    y_min: np.ndarray
+    y_max: np.ndarray
+    x_min: np.ndarray
+    x_max: np.ndarray
+
+    def shapes(self) -> np.ndarray:
+        """Return the (z, y, x) extent of each bounding box as an (n_spots, 3) array."""
+        return np.stack(
+            (self.z_max - self.z_min, self.y_max - self.y_min, self.x_max - self.x_min), axis=1)
+
+
+def _compute_bboxes(
+        spots: SpotAttributes,
+        image_shape: Tuple[int, ...],
+        radius_is_gyration: bool,
+) -> _BoundingBoxes:
+    """Compute the bounding box of each spot, clipped to the (z, y, x) image_shape.  The bounding
+    boxes are also recorded as the {z,y,x}_{min,max} columns of spots.data."""
+    radius = spots.data[Features.SPOT_RADIUS].to_numpy()
+    if radius_is_gyration:
+        radius = np.ceil(radius).astype(np.int64) + 1  # round up
+    else:
+        radius = radius.astype(np.int64)  # truncate down to nearest int
+    limits = {}
+    for v, max_size in zip(['z', 'y', 'x'], image_shape):
+        center = spots.data[v].to_numpy()
+        # numpy does exclusive max indexing, so need to subtract 1 from min to get centered box
+        limits[f'{v}_min'] = np.maximum(center - (radius - 1), 0).astype(np.int64, copy=False)
+        limits[f'{v}_max'] = np.minimum(center + radius, max_size).astype(np.int64, copy=False)
+    for column, values in limits.items():
+        spots.data[column] = values
+
+    return _BoundingBoxes(**limits)
+
+
+def _measure_bboxes_batched(
+        image: np.ndarray,
+        bboxes: _BoundingBoxes,
+        measurement_function: Callable,
+        out: np.ndarray,
+) -> None:
+    """Apply measurement_function over every bounding box in bboxes, writing the results to out.
+
+    image may have any number of axes ahead of its (z, y, x) axes, in which case out must have the
+    same leading axes followed by a spot axis.  Bounding boxes are grouped by shape, and each group
+    is gathered with fancy indexing into a (..., n_spots, z, y, x) array that is reduced over its
+    last three axes.  Empty bounding boxes are measured as nan."""
+    n_volumes = int(np.prod(image.shape[:-3]))
+    unique_shapes, group_ids = np.unique(bboxes.shapes(), axis=0, return_inverse=True)
+    for group_id, (dz, dy, dx) in enumerate(unique_shapes):
+        members = np.flatnonzero(group_ids == group_id)
+        if dz <= 0 or dy <= 0 or dx <= 0:
+            # degenerate bounding boxes contain no pixels to measure
+            out[..., members] = np.nan
+            continue
+        batch_size = max(1, _MAX_BATCH_PIXELS // max(1, n_volumes * dz * dy * dx))
+        for start in range(0, members.size, batch_size):
+            batch = members[start:start + batch_size]
+            z = bboxes.z_min[batch, None, None, None] + np.arange(dz)[None, :, None, None]
+            y = bboxes.y_min[batch, None, None, None] + np.arange(dy)[None, None, :, None]
+            x = bboxes.x_min[batch, None, None, None] + np.arange(dx)[None, None, None, :]
+            out[..., batch] = measurement_function(image[..., z, y, x], axis=(-3, -2, -1))
+
+
+def _measure_bboxes(
+        image: np.ndarray,
+        bboxes: _BoundingBoxes,
+        measurement_function: Callable[[np.ndarray], Number],
+        out: np.ndarray,
+) -> None:
+    """Apply measurement_function over every bounding box in bboxes of the (z, y, x) image, writing
+    the results to out.  Empty bounding boxes are measured as nan."""
+    if _is_batched_reduction(measurement_function):
+        _measure_bboxes_batched(image, bboxes, measurement_function, out)
+    else:
+        # iterate over plain numpy arrays rather than dispatching a python closure per row
+        z_min, z_max = bboxes.z_min, bboxes.z_max
+        y_min, y_max = bboxes.y_min, bboxes.y_max
+        x_min, x_max = bboxes.x_min, bboxes.x_max
+        # degenerate bounding boxes contain no pixels to measure
+        empty = (bboxes.shapes() <= 0).any(axis=1)
+        out[empty] = np.nan
+        for i in np.flatnonzero(~empty):
+            out[i] = measurement_function(
+                image[z_min[i]:z_max[i], y_min[i]:y_max[i], x_min[i]:x_max[i]])
+
 
 def measure_intensities_at_spot_locations_in_image(
         image: np.ndarray,
@@ -40,33 +150,28 @@ def measure_intensities_at_spot_locations_in_image(
     Returns
     -------
     pd.Series :
-        Intensities for each spot in SpotAttributes
+        Intensities for each spot in SpotAttributes.  Spots whose bounding box contains no pixels
+        (e.g. a radius that truncates to 0) are nan.
 
     """
 
-    def fn(row: pd.Series) -> Number:
-        d = image[row['z_min']:row['z_max'], row['y_min']:row['y_max'], row['x_min']:row['x_max']]
-        return measurement_function(d)
+    # strip any xarray wrapper once, so that each spot's bounding box is a plain numpy view into a
+    # contiguous buffer rather than a new DataArray
+    image = np.ascontiguousarray(image)
+    bboxes = _compute_bboxes(spots, image.shape, radius_is_gyration)
 
-    if radius_is_gyration:
-        radius = np.ceil(spots.data[Features.SPOT_RADIUS]).astype(int) + 1  # round up
-    else:
-        radius = spots.data[Features.SPOT_RADIUS].astype(int)  # truncate down to nearest int
-    for v, max_size in zip(['z', 'y', 'x'], image.shape):
-        # numpy does exclusive max indexing, so need to subtract 1 from min to get centered box
-        spots.data[f'{v}_min'] = np.clip(spots.data[v] - (radius - 1), 0, None)
-        spots.data[f'{v}_max'] = np.clip(spots.data[v] + radius, None, max_size)
-    return spots.data[['z_min', 'z_max', 'y_min', 'y_max', 'x_min', 'x_max']].astype(int).apply(
-        fn,
-        axis=1
-    )
+    # float64, so that empty bounding boxes can be recorded as nan
+    intensities = np.empty(len(spots.data), dtype=np.float64)
+    _measure_bboxes(image, bboxes, measurement_function, intensities)
+    return pd.Series(intensities, index=spots.data.index)
 
 
 def measure_intensities_at_spot_locations_across_imagestack(
         data_image: ImageStack,
         reference_spots: PerImageSliceSpotResults,
         measurement_function: Callable[[np.ndarray], Number],
-        radius_is_gyration: bool = False) -> SpotFindingResults:
+        radius_is_gyration: bool = False,
+        n_processes: Optional[int] = None) -> SpotFindingResults:
     """given spots found from a reference image, find those spots across a data_image
 
     Parameters
@@ -82,6 +187,11 @@ def measure_intensities_at_spot_locations_across_imagestack(
         a function of spot intensity, but typically is a smaller unit than the sigma generated
         by blob_log. In this case, the spot's bounding box is rounded up instead of down when
         measuring intensity. (default False)
+    n_processes : Optional[int]
+        Number of threads used to measure the (round, ch) tiles when measurement_function cannot
+        be batched across tiles.  If provided, measurement_function may be called from several
+        threads at once and must be thread-safe. (default None, in which case tiles are measured
+        serially)
 
     Returns
     -------
@@ -95,25 +205,53 @@ def measure_intensities_at_spot_locations_across_imagestack(
 
     spot_results = SpotFindingResults(imagestack_coords=data_image.xarray.coords,
                                       log=data_image.log)
-    # measure spots in each tile
-    indices = product(ch_labels, round_labels)
-    for c, r in indices:
-        tile_indices = {Axes.ROUND: r, Axes.CH: c}
-        if reference_spots.spot_attrs.data.empty:
-            # if no spots found don't measure
-            spot_results[tile_indices] = reference_spots
+
+    if reference_spots.spot_attrs.data.empty:
+        # if no spots found don't measure
+        for c, r in product(ch_labels, round_labels):
+            spot_results[{Axes.ROUND: r, Axes.CH: c}] = reference_spots
+        return spot_results
+
+    # integer (ch, round) positions of every tile, in the order they are added to spot_results
+    tile_positions = list(np.ndindex(len(ch_labels), len(round_labels)))
+
+    # read the (r, c, z, y, x) data once; each tile is then a view into this buffer
+    data = np.ascontiguousarray(data_image.xarray.transpose(
+        Axes.ROUND.value, Axes.CH.value, Axes.ZPLANE.value, Axes.Y.value, Axes.X.value))
+    # (round, ch, spot) intensities of every reference spot in every tile; float64, so that empty
+    # bounding boxes can be recorded as nan
+    intensities = np.empty(
+        (len(round_labels), len(ch_labels), len(reference_spots.spot_attrs.data)),
+        dtype=np.float64)
+    # the bounding boxes are the same in every tile
+    bboxes = _compute_bboxes(reference_spots.spot_attrs, data.shape[-3:], radius_is_gyration)
+    if _is_batched_reduction(measurement_function):
+        # reduce all tiles in a single pass
+        _measure_bboxes_batched(data, bboxes, measurement_function, intensities)
+    else:
+        def measure_tile(tile_position: Tuple[int, int]) -> None:
+            # each tile writes to its own (round, ch) row of intensities, so tiles can be measured
+            # concurrently
+            c_pos, r_pos = tile_position
+            _measure_bboxes(
+                data[r_pos, c_pos], bboxes, measurement_function, intensities[r_pos, c_pos])
+
+        if n_processes is None:
+            # arbitrary callables are not assumed to be thread-safe
+            for tile_position in tile_positions:
+                measure_tile(tile_position)
         else:
-            image, _ = data_image.get_slice({Axes.CH: c, Axes.ROUND: r})
-            blob_intensities: pd.Series = measure_intensities_at_spot_locations_in_image(
-                image,
-                reference_spots.spot_attrs,
-                measurement_function,
-                radius_is_gyration=radius_is_gyration
-            )
-            # copy reference spot positions and attributes
-            tile_spots = SpotAttributes(reference_spots.spot_attrs.data.copy())
-            # fill in intensities
-            tile_spots.data[Features.INTENSITY] = blob_intensities
-            spot_results[tile_indices] = PerImageSliceSpotResults(
-                spot_attrs=tile_spots, extras=None)
+            with ThreadPoolExecutor(max_workers=n_processes) as tpe:
+                # consume the results so that exceptions raised while measuring are propagated
+                list(tpe.map(measure_tile, tile_positions))
+
+    # assemble per-tile SpotAttributes from the measured intensities
+    for c_pos, r_pos in tile_positions:
+        c, r = ch_labels[c_pos], round_labels[r_pos]
+        # copy reference spot positions and attributes
+        tile_spots = SpotAttributes(reference_spots.spot_attrs.data.copy())
+        # fill in intensities
+        tile_spots.data[Features.INTENSITY] = intensities[r_pos, c_pos]
+        spot_results[{Axes.ROUND: r, Axes.CH: c}] = PerImageSliceSpotResults(
+            spot_attrs=tile_spots, extras=None)
     return spot_results
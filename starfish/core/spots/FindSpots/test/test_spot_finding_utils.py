@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from starfish import ImageStack
+from starfish.core.spots.FindSpots.spot_finding_utils import (
+    measure_intensities_at_spot_locations_across_imagestack,
+    measure_intensities_at_spot_locations_in_image,
+)
+from starfish.core.types import Axes, Features, PerImageSliceSpotResults, SpotAttributes
+
+
+def _spot_attributes(n_spots: int = 50) -> SpotAttributes:
+    rng = np.random.RandomState(0)
+    return SpotAttributes(pd.DataFrame({
+        Axes.ZPLANE.value: rng.randint(0, 4, n_spots),
+        Axes.Y.value: rng.randint(0, 20, n_spots),
+        Axes.X.value: rng.randint(0, 30, n_spots),
+        Features.SPOT_RADIUS: rng.uniform(1, 4, n_spots),
+    }))
+
+
+@pytest.mark.parametrize("measurement_function", [np.max, np.min, np.mean, np.sum, np.median])
+@pytest.mark.parametrize("radius_is_gyration", [False, True])
+def test_batched_reductions_match_per_spot_measurement(measurement_function, radius_is_gyration):
+    """The batched path for known numpy reductions should produce the same intensities as calling
+    the measurement function on each spot's bounding box individually."""
+    image = np.random.RandomState(1).rand(4, 20, 30).astype(np.float32)
+
+    batched = measure_intensities_at_spot_locations_in_image(
+        image, _spot_attributes(), measurement_function, radius_is_gyration)
+    per_spot = measure_intensities_at_spot_locations_in_image(
+        image, _spot_attributes(), lambda data: measurement_function(data), radius_is_gyration)
+
+    assert np.allclose(batched, per_spot)
+
+
+@pytest.mark.parametrize("measurement_function", [np.max, np.mean])
+def test_fused_imagestack_measurement_matches_per_tile_measurement(measurement_function):
+    """Measuring all tiles of an ImageStack in a single batched pass should produce the same
+    intensities as measuring each (round, ch) tile individually."""
+    data = np.random.RandomState(2).rand(2, 3, 4, 20, 30).astype(np.float32)
+    stack = ImageStack.from_numpy(data)
+    reference_spots = PerImageSliceSpotResults(spot_attrs=_spot_attributes(), extras=None)
+
+    results = measure_intensities_at_spot_locations_across_imagestack(
+        stack, reference_spots, measurement_function)
+
+    for r, c in product(range(2), range(3)):
+        expected = measure_intensities_at_spot_locations_in_image(
+            data[r, c], _spot_attributes(), lambda data: measurement_function(data))
+        measured = results[{Axes.ROUND: r, Axes.CH: c}].spot_attrs.data[Features.INTENSITY]
+        assert np.allclose(measured, expected)
+
+
+@pytest.mark.parametrize("measurement_function", [np.max, lambda data: np.max(data)])
+def test_empty_bounding_boxes_are_nan(measurement_function):
+    """Spots whose bounding boxes contain no pixels should be measured as nan rather than passed to
+    the measurement function."""
+    image = np.random.RandomState(3).rand(4, 20, 30).astype(np.float32)
+    spots = _spot_attributes(10)
+    spots.data.loc[[2, 5], Features.SPOT_RADIUS] = 0.5
+
+    intensities = measure_intensities_at_spot_locations_in_image(
+        image, spots, measurement_function)
+
+    assert np.isnan(intensities[[2, 5]]).all()
+    assert not np.isnan(intensities.drop([2, 5])).any()
+
+
+@dataclass
+class _Percentile:
+    """Unhashable measurement function (dataclasses with eq=True set __hash__ to None)."""
+    q: float
+
+    def __call__(self, data: np.ndarray) -> float:
+        return np.percentile(data, self.q)
+
+
+def test_unhashable_measurement_function():
+    """Measurement functions need not be hashable."""
+    image = np.random.RandomState(4).rand(4, 20, 30).astype(np.float32)
+
+    intensities = measure_intensities_at_spot_locations_in_image(
+        image, _spot_attributes(), _Percentile(90))
+    expected = measure_intensities_at_spot_locations_in_image(
+        image, _spot_attributes(), lambda data: np.percentile(data, 90))
+
+    assert np.allclose(intensities, expected)
+
+
+@pytest.mark.parametrize("n_processes", [None, 2])
+def test_per_tile_imagestack_measurement_matches_per_tile_measurement(n_processes):
+    """Measurement functions that cannot be batched are applied tile by tile, serially or on a
+    thread pool.  Either way, each (round, ch) tile should match measuring that tile directly."""
+    data = np.random.RandomState(5).rand(2, 3, 4, 20, 30).astype(np.float32)
+    stack = ImageStack.from_numpy(data)
+    reference_spots = PerImageSliceSpotResults(spot_attrs=_spot_attributes(), extras=None)
+
+    def measurement_function(data):
+        return np.percentile(data, 75)
+
+    results = measure_intensities_at_spot_locations_across_imagestack(
+        stack, reference_spots, measurement_function, n_processes=n_processes)
+
+    for r, c in product(range(2), range(3)):
+        expected = measure_intensities_at_spot_locations_in_image(
+            data[r, c], _spot_attributes(), measurement_function)
+        measured = results[{Axes.ROUND: r, Axes.CH: c}].spot_attrs.data[Features.INTENSITY]
+        assert np.allclose(measured, expected)
+
+
+@pytest.mark.parametrize("measurement_function", [np.max, lambda data: np.max(data)])
+def test_intensities_are_float64(measurement_function):
+    """Intensities are recorded as float64, regardless of the precision of the ImageStack data."""
+    stack = ImageStack.from_numpy(
+        np.random.RandomState(6).rand(2, 3, 4, 20, 30).astype(np.float32))
+    reference_spots = PerImageSliceSpotResults(spot_attrs=_spot_attributes(), extras=None)
+
+    results = measure_intensities_at_spot_locations_across_imagestack(
+        stack, reference_spots, measurement_function)
+
+    for spot_results in results.values():
+        assert spot_results.spot_attrs.data[Features.INTENSITY].dtype == np.float64
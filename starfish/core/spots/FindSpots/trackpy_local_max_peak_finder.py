@@ -172,7 +172,9 @@ class TrackpyLocalMaxPeakFinder(FindSpotsAlgorithm):
             (Optional) a reference image. If provided, spots will be found in this image, and then
             the locations that correspond to these spots will be measured across each channel.
         n_processes : Optional[int] = None,
-            Number of processes to devote to spot finding.
+            Number of processes to devote to spot finding.  If reference_image is provided, this
+            is also the number of threads used to measure the reference spots across the
+            (round, ch) tiles of image_stack.
         """
         spot_finding_method = partial(self.image_to_spots, *args)
         if reference_image:
@@ -182,7 +184,8 @@ class TrackpyLocalMaxPeakFinder(FindSpotsAlgorithm):
                 image_stack,
                 reference_spots,
                 measurement_function=self.measurement_function,
-                radius_is_gyration=self.radius_is_gyration)
+                radius_is_gyration=self.radius_is_gyration,
+                n_processes=n_processes)
         else:
             spot_attributes_list = image_stack.transform(
                 func=spot_finding_method,